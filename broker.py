@@ -1,21 +1,34 @@
-import asyncio
-from hbmqtt.broker import Broker
-
-config = {
-    'listeners': {
-        'default': {
-            'type': 'tcp',
-            'bind': '127.0.0.1:1883'
-        }
-    },
-    'sys_interval': 10,
-    'auth': {
-        'allow-anonymous': True,
-        'plugins': ['auth_anonymous']
-    }
-}
-
-broker = Broker(config)
-
-asyncio.get_event_loop().run_until_complete(broker.start())
-asyncio.get_event_loop().run_forever()
+import asyncio
+from amqtt.broker import Broker
+
+try:
+    import uvloop
+    uvloop.install()  # C event loop; drop-in replacement for asyncio's
+except ImportError:
+    pass  # uvloop is optional (e.g. unavailable on Windows)
+
+# amqtt is the maintained fork of hbmqtt; the config schema is unchanged.
+config = {
+    'listeners': {
+        'default': {
+            'type': 'tcp',
+            'bind': '127.0.0.1:1883'
+        }
+    },
+    'sys_interval': 10,
+    'auth': {
+        'allow-anonymous': True,
+        'plugins': ['auth_anonymous']
+    }
+}
+
+async def main():
+    broker = Broker(config)
+    await broker.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await broker.shutdown()
+
+if __name__ == "__main__":
+    asyncio.run(main())
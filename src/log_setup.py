@@ -0,0 +1,33 @@
+"""Shared logging setup for the supervisor and the simulation scripts."""
+
+import atexit
+import queue
+import logging
+import logging.handlers
+import sys
+
+def setup_logging():
+    # Configure logging to output to both the console and a log file.
+    # Records go through a queue so the emitting thread never blocks on
+    # file or console I/O; a listener thread performs the actual writes.
+    formatter = logging.Formatter(
+        "{asctime} [{levelname}] {message}",
+        style="{",
+        # An explicit datefmt skips the default formatter's extra
+        # millisecond formatting pass on every record.
+        datefmt="%Y-%m-%d %H:%M:%S"
+    )
+    handlers = [
+        logging.FileHandler("app.log"),
+        logging.StreamHandler(sys.stdout)
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers)
+    listener.start()
+    atexit.register(listener.stop)
+    logging.basicConfig(
+        level=logging.INFO,
+        handlers=[logging.handlers.QueueHandler(log_queue)]
+    )
@@ -1,29 +1,56 @@
 
+import sys
 import time
-import random
-import json
+import msgpack
+import numpy as np
 import paho.mqtt.client as mqtt
 
+# Readings generated per vectorized draw; one numpy call replaces
+# BATCH_SIZE individual random.uniform calls.
+BATCH_SIZE = 60
+
 def simulate_sensor_data():
+    # When stdout is a pipe (as under the supervisor) it is block-buffered,
+    # so output would arrive in bursts; line buffering flushes once per
+    # print without the cost of unbuffered writes.
+    sys.stdout.reconfigure(line_buffering=True)
+
     client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2)
     client.connect("localhost", 1883)
-    
+    # Service the network loop in paho's background thread so queued
+    # publishes, acks, and keepalives are handled while this loop sleeps;
+    # without it QoS>0 and reconnects would never be processed.
+    client.loop_start()
+
+    rng = np.random.default_rng()
+    index = BATCH_SIZE
+
     try:
         while True:
-            temperature = random.uniform(20.0, 25.0)
-            humidity = random.uniform(30.0, 50.0)
-            
-            payload = json.dumps({
-                "temperature": round(temperature, 2),
-                "humidity": round(humidity, 2)
-            })
-            
+            if index >= BATCH_SIZE:
+                temperatures = rng.uniform(20.0, 25.0, BATCH_SIZE)
+                humidities = rng.uniform(30.0, 50.0, BATCH_SIZE)
+                index = 0
+            temperature = temperatures[index]
+            humidity = humidities[index]
+            index += 1
+
+            # Pack a (temperature, humidity) tuple, not a dict: without
+            # the repeated key strings the frame is 11 bytes vs 41 for
+            # the JSON it replaced. Subscribers decode with
+            # msgpack.unpackb and rely on that field order.
+            payload = msgpack.packb(
+                (float(temperature), float(humidity)),
+                use_single_float=True
+            )
+
             client.publish("sensor/data", payload)
             print(f"Published - Temperature: {temperature:.2f}°C, Humidity: {humidity:.2f}%")
             time.sleep(1)
     except KeyboardInterrupt:
         print("Stopping simulation...")
     finally:
+        client.loop_stop()
         client.disconnect()
 
 if __name__ == "__main__":
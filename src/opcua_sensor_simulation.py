@@ -1,39 +1,73 @@
-from asyncua import ua, Server
-import asyncio
-import random
-
-async def main():
-    server = Server()
-    await server.init()
-    server.set_endpoint("opc.tcp://0.0.0.0:4840/freeopcua/server/")
-    
-    uri = "http://examples.freeopcua.github.io"
-    idx = await server.register_namespace(uri)
-    
-    # get_objects_node() is a synchronous method; remove the await
-    objects = server.get_objects_node()
-    
-    myobj = await objects.add_object(idx, "MyObject")
-    temperature = await myobj.add_variable(idx, "Temperature", 0.0)
-    humidity = await myobj.add_variable(idx, "Humidity", 0.0)
-    
-    await temperature.set_writable(True)
-    await humidity.set_writable(True)
-    
-    async with server:
-        print("OPC UA server started on port 4840")
-        while True:
-            try:
-                temp_value = random.uniform(20.0, 25.0)
-                hum_value = random.uniform(30.0, 50.0)
-                
-                await temperature.write_value(temp_value)
-                await humidity.write_value(hum_value)
-                
-                print(f"Updated - Temperature: {temp_value:.2f}°C, Humidity: {hum_value:.2f}%")
-                await asyncio.sleep(1)
-            except Exception as e:
-                print(f"Error: {e}")
-
-if __name__ == "__main__":
-    asyncio.run(main())
+from asyncua import ua, Server
+import asyncio
+import numpy as np
+from contextlib import asynccontextmanager
+
+# Readings generated per vectorized draw; one numpy call replaces
+# BATCH_SIZE individual random.uniform calls.
+BATCH_SIZE = 60
+
+try:
+    import uvloop
+    uvloop.install()  # C event loop; drop-in replacement for asyncio's
+except ImportError:
+    pass  # uvloop is optional (e.g. unavailable on Windows)
+
+@asynccontextmanager
+async def server_lifespan():
+    # Initialize the Server and its address space once; the update loop
+    # (re)uses the same instance rather than rebuilding endpoint,
+    # namespace, and nodes on every restart. Teardown happens when the
+    # lifespan exits.
+    server = Server()
+    await server.init()
+    server.set_endpoint("opc.tcp://0.0.0.0:4840/freeopcua/server/")
+
+    uri = "http://examples.freeopcua.github.io"
+    idx = await server.register_namespace(uri)
+
+    # get_objects_node() is a synchronous method; remove the await
+    objects = server.get_objects_node()
+
+    myobj = await objects.add_object(idx, "MyObject")
+    temperature = await myobj.add_variable(idx, "Temperature", 0.0)
+    humidity = await myobj.add_variable(idx, "Humidity", 0.0)
+
+    await temperature.set_writable(True)
+    await humidity.set_writable(True)
+
+    async with server:
+        yield server, temperature, humidity
+
+async def main():
+    async with server_lifespan() as (server, temperature, humidity):
+        print("OPC UA server started on port 4840")
+        rng = np.random.default_rng()
+        index = BATCH_SIZE
+        while True:
+            try:
+                if index >= BATCH_SIZE:
+                    temperatures = rng.uniform(20.0, 25.0, BATCH_SIZE)
+                    humidities = rng.uniform(30.0, 50.0, BATCH_SIZE)
+                    index = 0
+                temp_value = float(temperatures[index])
+                hum_value = float(humidities[index])
+                index += 1
+
+                # Write straight into the server's address space; node-level
+                # write_value goes through the full Write service (attribute
+                # lookup, permission checks) on every update.
+                await server.write_attribute_value(
+                    temperature.nodeid,
+                    ua.DataValue(ua.Variant(temp_value, ua.VariantType.Double)))
+                await server.write_attribute_value(
+                    humidity.nodeid,
+                    ua.DataValue(ua.Variant(hum_value, ua.VariantType.Double)))
+
+                print(f"Updated - Temperature: {temp_value:.2f}°C, Humidity: {hum_value:.2f}%")
+                await asyncio.sleep(1)
+            except Exception as e:
+                print(f"Error: {e}")
+
+if __name__ == "__main__":
+    asyncio.run(main())